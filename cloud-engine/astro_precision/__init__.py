@@ -1,3 +1,14 @@
-__all__ = ["compute_horoscope", "ComputeOptions"]
+__all__ = [
+    "compute_horoscope",
+    "compute_horoscope_coalesced",
+    "coalescing_key",
+    "coalescing_stats",
+    "ComputeOptions",
+]
 
-from .core.engine import compute_horoscope, ComputeOptions
+def __getattr__(name):
+    # Deferred: importing the engine pulls in swisseph, which the /health path never needs.
+    if name in __all__:
+        from .core import engine
+        return getattr(engine, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
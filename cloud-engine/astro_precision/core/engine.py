@@ -1,8 +1,10 @@
 from __future__ import annotations
 
+import json
 import os
-from dataclasses import dataclass
+from dataclasses import asdict, dataclass
 from datetime import datetime, timezone, timedelta
+from functools import lru_cache
 from typing import Dict, Any, List, Tuple, Optional
 
 import swisseph as swe
@@ -13,6 +15,7 @@ from .time import (
     AmbiguousLocalTimeError,
     NonexistentLocalTimeError,
 )
+from .singleflight import SingleFlight
 from ..models import ValidationIssue, ValidationReport
 
 PLANET_BODIES = [
@@ -42,10 +45,17 @@ ANIMALS_DE = ["Ratte","Büffel","Tiger","Hase","Drache","Schlange","Pferd","Zieg
 class EphemerisError(RuntimeError):
     pass
 
+_EPHE_PATH_APPLIED: Optional[str] = None
+
 def _set_ephe_path_or_fail(strict_mode: bool) -> None:
+    global _EPHE_PATH_APPLIED
     ephe = os.getenv("SE_EPHE_PATH")
     if ephe:
-        swe.set_ephe_path(ephe)
+        # swe.set_ephe_path closes all open ephemeris files; only call it when the path changes,
+        # otherwise every request pays for re-opening the .se1 files.
+        if ephe != _EPHE_PATH_APPLIED:
+            swe.set_ephe_path(ephe)
+            _EPHE_PATH_APPLIED = ephe
         return
     # Without ephe path, SWIEPH may fail depending on environment.
     if strict_mode:
@@ -55,15 +65,24 @@ def _set_ephe_path_or_fail(strict_mode: bool) -> None:
         )
 
 def _choose_flags(strict_mode: bool) -> Tuple[int, List[ValidationIssue]]:
-    issues: List[ValidationIssue] = []
     allow_moshier = os.getenv("ASTRO_PRECISION_ALLOW_MOSHIER") == "1"
+    flags, issues = _probe_flags(strict_mode, allow_moshier, _EPHE_PATH_APPLIED)
+    return flags, list(issues)
+
+@lru_cache(maxsize=8)
+def _probe_flags(strict_mode: bool, allow_moshier: bool, ephe_path: Optional[str]) -> Tuple[int, Tuple[ValidationIssue, ...]]:
+    """
+    Ephemeris probe, cached per (strict_mode, allow_moshier, ephe_path).
+    Failures in strict mode raise and are therefore never cached.
+    """
+    issues: List[ValidationIssue] = []
 
     flags_sw = swe.FLG_SWIEPH | swe.FLG_SPEED
     # Probe: try a simple calc to verify ephemeris availability
     try:
         jd_probe = swe.julday(2025, 1, 1, 0.0, swe.GREG_CAL)
         swe.calc_ut(jd_probe, swe.SUN, flags_sw)
-        return flags_sw, issues
+        return flags_sw, tuple(issues)
     except Exception as e:
         if strict_mode and not allow_moshier:
             raise EphemerisError(
@@ -79,7 +98,7 @@ def _choose_flags(strict_mode: bool) -> Tuple[int, List[ValidationIssue]]:
             severity="warn" if not strict_mode else "error",
             details={"exception": str(e)},
         ))
-        return flags_mo, issues
+        return flags_mo, tuple(issues)
 
 def _deg_to_sign(lon: float) -> Tuple[str, int, float]:
     lon = lon % 360.0
@@ -178,7 +197,13 @@ class ComputeOptions:
     fold: Optional[int] = None
     ut1_minus_utc_seconds: float = 0.0
 
-def compute_horoscope(payload: Dict[str, Any], *, options: ComputeOptions) -> Dict[str, Any]:
+def compute_horoscope(payload: Dict[str, Any], *, options: ComputeOptions, stage_cache: bool = True) -> Dict[str, Any]:
+    """
+    Compute the precision horoscope for one birth payload.
+
+    stage_cache=False computes planets, houses and Li Chun from scratch without reading or
+    filling the stage caches (used by request profiling); the caches of live traffic stay untouched.
+    """
     issues: List[ValidationIssue] = []
 
     # --- Validate input
@@ -270,35 +295,20 @@ def compute_horoscope(payload: Dict[str, Any], *, options: ComputeOptions) -> Di
     delta_t_seconds = delta_t_days * 86400.0
 
     # --- Planets
-    planets: Dict[str, Any] = {}
-    for name, body in PLANET_BODIES:
-        try:
-            vals = swe.calc_ut(jd_ut, body, flags)[0]
-            lon_ecl = float(vals[0])
-            lat_ecl = float(vals[1])
-            dist = float(vals[2])
-            speed = float(vals[3]) if len(vals) > 3 else None
-        except Exception as e:
-            issues.append(ValidationIssue(
-                code="planet_calc_failed",
-                message=f"Failed to compute {name}: {e}",
-                severity="error",
-            ))
-            return _finalize_error(payload, issues)
-        lon_norm = lon_ecl % 360.0
-        sign, sign_i, deg_in_sign = _deg_to_sign(lon_norm)
-        planets[name] = {
-            "longitude": lon_norm,
-            "sign": sign,
-            "degree_in_sign": deg_in_sign,
-            "speed_longitude_deg_per_day": speed,
-        }
+    try:
+        planets = _stage_planets(jd_ut, flags, cached=stage_cache)
+    except PlanetCalcError as e:
+        issues.append(ValidationIssue(
+            code="planet_calc_failed",
+            message=f"Failed to compute {e.body_name}: {e}",
+            severity="error",
+        ))
+        return _finalize_error(payload, issues)
 
     # --- Houses / Asc
     try:
-        cusps, ascmc = swe.houses_ex(jd_ut, lat, lon, hsys.encode('ascii'), flags)
-        asc = float(ascmc[0]) % 360.0
-        mc = float(ascmc[1]) % 360.0
+        houses_stage = _stage_houses if stage_cache else _stage_houses.__wrapped__
+        cusps, asc, mc = houses_stage(jd_ut, lat, lon, hsys, flags)
     except Exception as e:
         issues.append(ValidationIssue(
             code="houses_calc_failed",
@@ -308,11 +318,12 @@ def compute_horoscope(payload: Dict[str, Any], *, options: ComputeOptions) -> Di
         return _finalize_error(payload, issues)
 
     asc_sign, _, asc_deg_in_sign = _deg_to_sign(asc)
-    houses = {str(i): float(cusps[i-1]) % 360.0 for i in range(1, 13)}
+    houses = {str(i): cusps[i-1] for i in range(1, 13)}
 
     # --- Li Chun + Chinese year pillar
     try:
-        li_chun = find_li_chun_utc(conv.utc_dt.year, flags=flags)
+        li_chun_stage = _stage_li_chun if stage_cache else _stage_li_chun.__wrapped__
+        li_chun = li_chun_stage(conv.utc_dt.year, flags)
         cny = chinese_year_pillar(birth_utc=conv.utc_dt, li_chun_utc=li_chun)
     except Exception as e:
         issues.append(ValidationIssue(
@@ -365,17 +376,119 @@ def compute_horoscope(payload: Dict[str, Any], *, options: ComputeOptions) -> Di
     }
     return out
 
+# ----------------- Request coalescing -----------------
+
+_COMPUTE_FLIGHTS = SingleFlight()
+
+def coalescing_key(payload: Dict[str, Any], options: ComputeOptions) -> str:
+    """Canonical key: identical payload + options -> identical result (incl. input_echo on errors)."""
+    return json.dumps({"payload": payload, "options": asdict(options)}, sort_keys=True, default=str)
+
+def compute_horoscope_coalesced(payload: Dict[str, Any], *, options: ComputeOptions, key: Optional[str] = None) -> Dict[str, Any]:
+    """
+    compute_horoscope with single-flight for synchronous in-process callers (batch jobs, CLI):
+    concurrent calls with the same input share one computation and receive the same result
+    object, including validation errors such as the 409/422 DST results. The returned dict is
+    shared and must not be mutated. main.py coalesces on the event loop instead (AsyncSingleFlight).
+    """
+    result, _ = _COMPUTE_FLIGHTS.do(key or coalescing_key(payload, options), compute_horoscope, payload, options=options)
+    return result
+
+def coalescing_stats() -> Dict[str, Any]:
+    return _COMPUTE_FLIGHTS.stats()
+
+# ----------------- Stage cache -----------------
+#
+# compute_horoscope is split into stages with disjoint inputs:
+#   planets  <- (jd_ut, flags)
+#   houses   <- (jd_ut, lat, lon, house_system, flags)
+#   li_chun  <- (year, flags)
+# Each stage has its own bounded LRU layer, so a request that only changes location or
+# house system ("what if you were born in another city") reuses the planet positions.
+
+STAGE_CACHE_SIZE = int(os.getenv("ASTRO_PRECISION_STAGE_CACHE_SIZE", "4096"))
+
+class PlanetCalcError(RuntimeError):
+    def __init__(self, body_name: str, cause: Exception):
+        super().__init__(str(cause))
+        self.body_name = body_name
+
+@lru_cache(maxsize=STAGE_CACHE_SIZE)
+def _planet_positions(jd_ut: float, flags: int) -> Tuple[Tuple[str, float, Optional[float]], ...]:
+    rows: List[Tuple[str, float, Optional[float]]] = []
+    for name, body in PLANET_BODIES:
+        try:
+            vals = swe.calc_ut(jd_ut, body, flags)[0]
+            lon_ecl = float(vals[0])
+            speed = float(vals[3]) if len(vals) > 3 else None
+        except Exception as e:
+            raise PlanetCalcError(name, e) from e
+        rows.append((name, lon_ecl % 360.0, speed))
+    return tuple(rows)
+
+def _stage_planets(jd_ut: float, flags: int, *, cached: bool = True) -> Dict[str, Any]:
+    # Fresh dicts per call: the cached layer holds only immutable tuples.
+    positions = _planet_positions if cached else _planet_positions.__wrapped__
+    planets: Dict[str, Any] = {}
+    for name, lon_norm, speed in positions(jd_ut, flags):
+        sign, _, deg_in_sign = _deg_to_sign(lon_norm)
+        planets[name] = {
+            "longitude": lon_norm,
+            "sign": sign,
+            "degree_in_sign": deg_in_sign,
+            "speed_longitude_deg_per_day": speed,
+        }
+    return planets
+
+@lru_cache(maxsize=STAGE_CACHE_SIZE)
+def _stage_houses(jd_ut: float, lat: float, lon: float, hsys: str, flags: int) -> Tuple[Tuple[float, ...], float, float]:
+    cusps, ascmc = swe.houses_ex(jd_ut, lat, lon, hsys.encode('ascii'), flags)
+    return (
+        tuple(float(cusps[i]) % 360.0 for i in range(12)),
+        float(ascmc[0]) % 360.0,
+        float(ascmc[1]) % 360.0,
+    )
+
+@lru_cache(maxsize=512)
+def _stage_li_chun(year: int, flags: int) -> datetime:
+    return find_li_chun_utc(year, flags=flags)
+
+_STAGES = {
+    "planets": _planet_positions,
+    "houses": _stage_houses,
+    "li_chun": _stage_li_chun,
+}
+
+def stage_cache_info() -> Dict[str, Dict[str, Any]]:
+    """Hit/miss/size counters per stage layer."""
+    return {name: fn.cache_info()._asdict() for name, fn in _STAGES.items()}
+
+def clear_stage_caches() -> None:
+    for fn in _STAGES.values():
+        fn.cache_clear()
+
 # ----------------- Crosschecks -----------------
 
-def _load_csv_rows(path: str) -> List[List[str]]:
-    rows: List[List[str]] = []
+@lru_cache(maxsize=None)
+def _load_csv_rows(path: str) -> Tuple[Tuple[str, ...], ...]:
+    # Assets are static for the lifetime of the process; read each file once.
+    rows: List[Tuple[str, ...]] = []
     with open(path, "r", encoding="utf-8") as f:
         for line in f:
             line = line.strip()
             if not line or line.startswith("#"):
                 continue
-            rows.append([c.strip() for c in line.split(",")])
-    return rows
+            rows.append(tuple(c.strip() for c in line.split(",")))
+    return tuple(rows)
+
+CROSSCHECK_ASSETS = ("zodiac-table-west.csv", "deltaT-reference.txt", "zodiac-table-chinese.csv")
+
+def prime_assets() -> None:
+    """Load all crosscheck asset tables into the process cache (used by the startup warm-up)."""
+    import pathlib
+    assets = pathlib.Path(__file__).resolve().parents[2] / "assets"
+    for name in CROSSCHECK_ASSETS:
+        _load_csv_rows(str(assets / name))
 
 def _crosscheck_sun_sign(local_date, sun_sign_from_lon: str, sun_lon: float) -> List[ValidationIssue]:
     """
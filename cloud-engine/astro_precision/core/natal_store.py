@@ -0,0 +1,221 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from .engine import ANIMALS_DE, BRANCHES, PLANET_BODIES, STEMS, ZODIAC_SIGNS_DE
+
+LAYOUT_VERSION = 1
+RECORDS_FILE = "records.bin"
+LAYOUT_FILE = "layout.json"
+
+ELEMENTS = ["Wood", "Fire", "Earth", "Metal", "Water"]
+YIN_YANG = ["Yang", "Yin"]
+
+def _body_key(name: str) -> str:
+    return name.lower()
+
+# One fixed-size record per chart; columns are read as strided views of the memmap.
+RECORD_DTYPE = np.dtype(
+    [("user_id", np.int64)]
+    + [(f"{_body_key(name)}_lon", np.float32) for name, _ in PLANET_BODIES]
+    + [(f"{_body_key(name)}_sign", np.uint8) for name, _ in PLANET_BODIES]
+    + [
+        ("asc_lon", np.float32),
+        ("asc_sign", np.uint8),
+        ("chinese_year_for_pillar", np.int16),
+        ("chinese_stem", np.uint8),
+        ("chinese_branch", np.uint8),
+        ("chinese_element", np.uint8),
+        ("chinese_yin_yang", np.uint8),
+    ]
+)
+
+# Categorical columns: accepted labels per column (several label sets may map to the same index).
+CATEGORY_LABELS: Dict[str, Tuple[Sequence[str], ...]] = {
+    **{f"{_body_key(name)}_sign": (ZODIAC_SIGNS_DE,) for name, _ in PLANET_BODIES},
+    "asc_sign": (ZODIAC_SIGNS_DE,),
+    "chinese_stem": (STEMS,),
+    "chinese_branch": (BRANCHES, ANIMALS_DE),
+    "chinese_element": (ELEMENTS,),
+    "chinese_yin_yang": (YIN_YANG,),
+}
+
+Criterion = Union[int, float, str, Sequence[Union[int, str]]]
+
+class NatalStore:
+    """
+    Columnar, memory-mapped store of natal positions (one record per chart, RECORD_DTYPE).
+
+    Layout on disk: <path>/records.bin (raw records, append-only) and <path>/layout.json.
+    Queries evaluate vectorized predicates over the memmap in chunks, so filtering and
+    aggregating over millions of charts never parses JSON per row.
+
+        store = NatalStore("/data/natal")
+        store.append([(user_id, compute_horoscope(...)), ...])
+        store.count(moon_sign="Skorpion", chinese_branch="Tiger")
+        store.group_counts("sun_sign", chinese_branch="Tiger")
+    """
+
+    def __init__(self, path: Union[str, Path], *, chunk_rows: int = 1_000_000):
+        self.path = Path(path)
+        self.chunk_rows = chunk_rows
+        self.path.mkdir(parents=True, exist_ok=True)
+        self._records_path = self.path / RECORDS_FILE
+        layout_path = self.path / LAYOUT_FILE
+        layout = {"version": LAYOUT_VERSION, "dtype": RECORD_DTYPE.descr}
+        if layout_path.exists():
+            stored = json.loads(layout_path.read_text(encoding="utf-8"))
+            if stored.get("version") != LAYOUT_VERSION or [list(d) for d in stored.get("dtype", [])] != [list(d) for d in RECORD_DTYPE.descr]:
+                raise ValueError(f"Incompatible natal store layout in {self.path}")
+        else:
+            layout_path.write_text(json.dumps(layout), encoding="utf-8")
+            self._records_path.touch()
+        self._mm: Optional[np.memmap] = None
+        self._mm_rows = 0
+
+    # ----------------- Write
+
+    def __len__(self) -> int:
+        # Whole records only: a torn trailing write is ignored until it completes.
+        return self._records_path.stat().st_size // RECORD_DTYPE.itemsize
+
+    @staticmethod
+    def to_record(user_id: int, chart: Dict[str, Any], out: np.ndarray) -> bool:
+        """
+        Fill one RECORD_DTYPE slot from a compute_horoscope result. Returns False for error results
+        and malformed charts (missing bodies/fields, unknown labels); the slot is then left for reuse.
+        """
+        planets = chart.get("planets")
+        cy = chart.get("chinese_year")
+        asc = chart.get("ascendant")
+        if not planets or not cy or not asc:
+            return False
+        try:
+            out["user_id"] = user_id
+            for name, _ in PLANET_BODIES:
+                lon = float(planets[name]["longitude"]) % 360.0
+                out[f"{_body_key(name)}_lon"] = lon
+                out[f"{_body_key(name)}_sign"] = int(lon // 30.0) % 12
+            asc_lon = float(asc["longitude"]) % 360.0
+            out["asc_lon"] = asc_lon
+            out["asc_sign"] = int(asc_lon // 30.0) % 12
+            out["chinese_year_for_pillar"] = int(cy["year_for_pillar"])
+            out["chinese_stem"] = STEMS.index(cy["stem"])
+            out["chinese_branch"] = BRANCHES.index(cy["branch"])
+            out["chinese_element"] = ELEMENTS.index(cy["element"])
+            out["chinese_yin_yang"] = YIN_YANG.index(cy["yin_yang"])
+        except (KeyError, TypeError, ValueError, OverflowError):
+            return False
+        return True
+
+    def append(self, charts: Iterable[Tuple[int, Dict[str, Any]]], *, batch_rows: int = 65_536) -> int:
+        """
+        Append (user_id, compute_horoscope result) pairs. Error results and malformed charts are
+        skipped (see to_record). Returns the number of records written.
+        """
+        written = 0
+        buf = np.zeros(batch_rows, dtype=RECORD_DTYPE)
+        n = 0
+        with open(self._records_path, "ab") as f:
+            for user_id, chart in charts:
+                if not self.to_record(user_id, chart, buf[n]):
+                    continue
+                n += 1
+                if n == batch_rows:
+                    f.write(buf.tobytes())
+                    written += n
+                    n = 0
+            if n:
+                f.write(buf[:n].tobytes())
+                written += n
+        return written
+
+    def append_records(self, records: np.ndarray) -> int:
+        """Append a prebuilt RECORD_DTYPE array (e.g. from a bulk export)."""
+        if records.dtype != RECORD_DTYPE:
+            raise ValueError("records must use RECORD_DTYPE")
+        with open(self._records_path, "ab") as f:
+            f.write(np.ascontiguousarray(records).tobytes())
+        return int(records.size)
+
+    # ----------------- Read
+
+    @property
+    def records(self) -> np.ndarray:
+        """Read-only memmap over all complete records; remapped after appends."""
+        rows = len(self)
+        if self._mm is None or rows != self._mm_rows:
+            self._mm = (
+                np.memmap(self._records_path, dtype=RECORD_DTYPE, mode="r", shape=(rows,))
+                if rows else np.zeros(0, dtype=RECORD_DTYPE)
+            )
+            self._mm_rows = rows
+        return self._mm
+
+    def column(self, name: str) -> np.ndarray:
+        return self.records[name]
+
+    @staticmethod
+    def _encode(column: str, value: Union[int, float, str]) -> Union[int, float]:
+        if not isinstance(value, str):
+            return value
+        for labels in CATEGORY_LABELS.get(column, ()):
+            if value in labels:
+                return list(labels).index(value)
+        raise ValueError(f"Unknown label {value!r} for column {column!r}")
+
+    def _predicate(self, column: str, criterion: Criterion):
+        if column not in RECORD_DTYPE.names:
+            raise ValueError(f"Unknown column: {column}")
+        if isinstance(criterion, (list, tuple, set, frozenset)):
+            codes = np.array([self._encode(column, v) for v in criterion])
+            return lambda block: np.isin(block[column], codes)
+        code = self._encode(column, criterion)
+        return lambda block: block[column] == code
+
+    def mask(self, **criteria: Criterion) -> np.ndarray:
+        """
+        Boolean row mask for AND-combined criteria. Values are raw codes, labels
+        (e.g. moon_sign="Skorpion", chinese_branch="Tiger") or collections of either (IN).
+        """
+        preds = [self._predicate(col, crit) for col, crit in criteria.items()]
+        records = self.records
+        out = np.ones(records.shape[0], dtype=bool)
+        for start in range(0, records.shape[0], self.chunk_rows):
+            block = records[start:start + self.chunk_rows]
+            view = out[start:start + self.chunk_rows]
+            for pred in preds:
+                view &= pred(block)
+        return out
+
+    def between(self, column: str, lo: float, hi: float, *, mask: Optional[np.ndarray] = None) -> np.ndarray:
+        """lo <= column < hi; for *_lon columns lo > hi wraps through 0° (e.g. 350..10)."""
+        values = self.column(column)
+        if column.endswith("_lon") and lo > hi:
+            hit = (values >= lo) | (values < hi)
+        else:
+            hit = (values >= lo) & (values < hi)
+        return hit if mask is None else hit & mask
+
+    def count(self, **criteria: Criterion) -> int:
+        return int(np.count_nonzero(self.mask(**criteria)))
+
+    def user_ids(self, **criteria: Criterion) -> np.ndarray:
+        return np.asarray(self.column("user_id")[self.mask(**criteria)])
+
+    def group_counts(self, column: str, *, mask: Optional[np.ndarray] = None, **criteria: Criterion) -> Dict[Union[str, int], int]:
+        """Histogram of a categorical/integer column over the rows matching mask and criteria."""
+        rows = self.mask(**criteria)
+        if mask is not None:
+            rows &= mask
+        values = np.asarray(self.column(column)[rows]).astype(np.int64)
+        labels = CATEGORY_LABELS.get(column)
+        if labels:
+            counts = np.bincount(values, minlength=len(labels[0]))
+            return {labels[0][i]: int(c) for i, c in enumerate(counts)}
+        uniq, counts = np.unique(values, return_counts=True)
+        return {int(u): int(c) for u, c in zip(uniq, counts)}
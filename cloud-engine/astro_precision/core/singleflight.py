@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+class _Stats:
+    def __init__(self) -> None:
+        self.calls = 0
+        self.executions = 0
+        self.coalesced = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "executions": self.executions,
+            "coalesced": self.coalesced,
+            "coalesce_rate": (self.coalesced / self.calls) if self.calls else 0.0,
+        }
+
+class _Call:
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+class SingleFlight:
+    """
+    Thread-safe single-flight: concurrent do() calls with the same key wait for one
+    execution of fn and all receive its result (or its exception).
+    Shared results are the same object for every caller and must be treated as read-only.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+        self._stats = _Stats()
+
+    def do(self, key: Hashable, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Tuple[Any, bool]:
+        """Returns (result, shared); shared is True if this caller joined an in-flight execution."""
+        with self._lock:
+            self._stats.calls += 1
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self._stats.executions += 1
+            else:
+                self._stats.coalesced += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+
+        try:
+            call.result = fn(*args, **kwargs)
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result, False
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return self._stats.to_dict()
+
+class AsyncSingleFlight:
+    """
+    asyncio variant for request handlers: followers await the leader's task and never
+    occupy a worker thread while waiting. Must be used from a single event loop.
+
+    The shared work runs as its own task; every caller (leader included) awaits it through
+    asyncio.shield, so cancelling one waiter never cancels the work or the other waiters.
+    """
+
+    def __init__(self) -> None:
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+        self._stats = _Stats()
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Tuple[Any, bool]:
+        """Returns (result, shared); shared is True if this caller joined an in-flight execution."""
+        self._stats.calls += 1
+        task = self._inflight.get(key)
+        shared = task is not None
+        if shared:
+            self._stats.coalesced += 1
+        else:
+            task = asyncio.ensure_future(fn())
+            self._inflight[key] = task
+            task.add_done_callback(lambda t: self._finish(key, t))
+            self._stats.executions += 1
+        return await asyncio.shield(task), shared
+
+    def _finish(self, key: Hashable, task: asyncio.Future) -> None:
+        self._inflight.pop(key, None)
+        # Mark the exception as retrieved even if every waiter was cancelled.
+        if not task.cancelled():
+            task.exception()
+
+    def stats(self) -> Dict[str, Any]:
+        return self._stats.to_dict()
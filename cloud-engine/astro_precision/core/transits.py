@@ -0,0 +1,192 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .engine import (
+    PLANET_BODIES,
+    _choose_flags,
+    _jd_ut_from_utc,
+    _planet_positions,
+    _set_ephe_path_or_fail,
+)
+from ..models import ValidationIssue
+
+# Aspect name -> exact angle (deg). Orbs are configurable per call.
+ASPECT_ANGLES: Dict[str, float] = {
+    "conjunction": 0.0,
+    "sextile": 60.0,
+    "square": 90.0,
+    "trine": 120.0,
+    "opposition": 180.0,
+}
+
+DEFAULT_ORBS: Dict[str, float] = {
+    "conjunction": 8.0,
+    "sextile": 4.0,
+    "square": 6.0,
+    "trine": 6.0,
+    "opposition": 8.0,
+}
+
+NATAL_BODIES: Tuple[str, ...] = tuple(name for name, _ in PLANET_BODIES)
+
+# One row per (user, transit body, natal body, aspect) hit.
+HIT_DTYPE = np.dtype([
+    ("user_index", np.int64),
+    ("transit_body", np.uint8),
+    ("natal_body", np.uint8),
+    ("aspect", np.uint8),
+    ("orb", np.float32),
+])
+
+@dataclass(frozen=True)
+class TransitSky:
+    """Planet positions at one timestamp; identical for every user."""
+    utc: datetime
+    jd_ut: float
+    flags: int
+    bodies: Tuple[str, ...]
+    longitudes: np.ndarray
+    speeds: np.ndarray
+    # Ephemeris issues from flag selection, e.g. "ephemeris_fallback_moshier".
+    issues: Tuple[ValidationIssue, ...] = ()
+
+def compute_sky(when_utc: datetime, *, strict_mode: bool = True, ut1_minus_utc_seconds: float = 0.0) -> TransitSky:
+    """
+    Compute the sky once per timestamp (PLANET_BODIES), reusing the engine's planet stage cache.
+    Raises EphemerisError under the same conditions as compute_horoscope; a fallback to
+    Moshier is reported in TransitSky.issues.
+    """
+    if when_utc.tzinfo is None:
+        raise ValueError("when_utc must be timezone-aware")
+    utc = when_utc.astimezone(timezone.utc)
+    _set_ephe_path_or_fail(strict_mode)
+    flags, issues = _choose_flags(strict_mode)
+    jd_ut = _jd_ut_from_utc(utc, ut1_minus_utc_seconds)
+    rows = _planet_positions(jd_ut, flags)
+    return TransitSky(
+        utc=utc,
+        jd_ut=jd_ut,
+        flags=flags,
+        bodies=tuple(name for name, _, _ in rows),
+        longitudes=np.array([lon for _, lon, _ in rows], dtype=np.float64),
+        speeds=np.array([np.nan if speed is None else speed for _, _, speed in rows], dtype=np.float64),
+        issues=tuple(issues),
+    )
+
+def stack_natal_longitudes(charts: Iterable[Dict[str, Any]], *, bodies: Sequence[str] = NATAL_BODIES) -> np.ndarray:
+    """
+    Stack stored compute_horoscope results into an (N, len(bodies)) float32 array.
+    "Ascendant" and "MC" are accepted as body names; missing bodies become NaN (never aspected).
+    """
+    rows: List[List[float]] = []
+    for chart in charts:
+        planets = chart.get("planets", {})
+        row: List[float] = []
+        for body in bodies:
+            if body == "Ascendant":
+                src = chart.get("ascendant")
+            elif body == "MC":
+                src = chart.get("mc")
+            else:
+                src = planets.get(body)
+            row.append(float(src["longitude"]) if src else np.nan)
+        rows.append(row)
+    return np.array(rows, dtype=np.float32).reshape(len(rows), len(bodies))
+
+def _resolve_orbs(orbs: Optional[Dict[str, float]]) -> List[Tuple[int, float, float]]:
+    merged = dict(DEFAULT_ORBS)
+    if orbs:
+        unknown = set(orbs) - set(ASPECT_ANGLES)
+        if unknown:
+            raise ValueError(f"Unknown aspect(s): {sorted(unknown)}")
+        merged.update(orbs)
+    names = list(ASPECT_ANGLES)
+    return [(names.index(a), ASPECT_ANGLES[a], float(orb)) for a, orb in merged.items() if orb > 0]
+
+def iter_aspect_hit_chunks(
+    sky: TransitSky,
+    natal_longitudes: np.ndarray,
+    *,
+    orbs: Optional[Dict[str, float]] = None,
+    chunk_size: int = 50_000,
+) -> Iterator[np.ndarray]:
+    """
+    Evaluate transit-to-natal aspects for all users, `chunk_size` users at a time.
+
+    natal_longitudes: (N, B) array (e.g. from stack_natal_longitudes or a memory-mapped file).
+    Yields one HIT_DTYPE array per chunk, ordered by user_index. Peak memory is
+    O(chunk_size * len(sky.bodies) * B), independent of N.
+    """
+    if natal_longitudes.ndim != 2:
+        raise ValueError("natal_longitudes must be a 2-D (users x bodies) array")
+    if chunk_size <= 0:
+        raise ValueError("chunk_size must be positive")
+    aspects = _resolve_orbs(orbs)
+    transit = sky.longitudes.astype(np.float32)[None, :, None]
+
+    for start in range(0, natal_longitudes.shape[0], chunk_size):
+        natal = np.asarray(natal_longitudes[start:start + chunk_size], dtype=np.float32)
+        # Angular separation in [0, 180], shape (users, transit bodies, natal bodies)
+        sep = np.abs((natal[:, None, :] - transit + 180.0) % 360.0 - 180.0)
+
+        parts: List[np.ndarray] = []
+        for aspect_i, angle, orb in aspects:
+            dev = np.abs(sep - angle)
+            u, t, n = np.nonzero(dev <= orb)
+            if u.size == 0:
+                continue
+            part = np.empty(u.size, dtype=HIT_DTYPE)
+            part["user_index"] = u + start
+            part["transit_body"] = t
+            part["natal_body"] = n
+            part["aspect"] = aspect_i
+            part["orb"] = dev[u, t, n]
+            parts.append(part)
+
+        if not parts:
+            yield np.empty(0, dtype=HIT_DTYPE)
+            continue
+        hits = np.concatenate(parts)
+        yield hits[np.argsort(hits["user_index"], kind="stable")]
+
+def iter_user_aspects(
+    sky: TransitSky,
+    natal_longitudes: np.ndarray,
+    user_ids: Sequence[Any],
+    *,
+    natal_bodies: Sequence[str] = NATAL_BODIES,
+    orbs: Optional[Dict[str, float]] = None,
+    chunk_size: int = 50_000,
+) -> Iterator[Tuple[Any, List[Dict[str, Any]]]]:
+    """Stream (user_id, hits) for every user with at least one aspect hit."""
+    if len(user_ids) != natal_longitudes.shape[0]:
+        raise ValueError("user_ids and natal_longitudes must have the same length")
+    if natal_longitudes.ndim != 2 or len(natal_bodies) != natal_longitudes.shape[1]:
+        raise ValueError("natal_bodies must name every column of natal_longitudes")
+    aspect_names = list(ASPECT_ANGLES)
+
+    for hits in iter_aspect_hit_chunks(sky, natal_longitudes, orbs=orbs, chunk_size=chunk_size):
+        if hits.size == 0:
+            continue
+        users, starts = np.unique(hits["user_index"], return_index=True)
+        bounds = starts.tolist()[1:] + [hits.size]
+        # Column lists once per chunk; indexing structured scalars per hit is far slower.
+        transit_b = hits["transit_body"].tolist()
+        natal_b = hits["natal_body"].tolist()
+        aspect_i = hits["aspect"].tolist()
+        orb = hits["orb"].tolist()
+        for user_i, lo, hi in zip(users.tolist(), starts.tolist(), bounds):
+            yield user_ids[user_i], [
+                {
+                    "transit_body": sky.bodies[transit_b[k]],
+                    "natal_body": natal_bodies[natal_b[k]],
+                    "aspect": aspect_names[aspect_i[k]],
+                    "orb": orb[k],
+                }
+                for k in range(lo, hi)
+            ]
@@ -0,0 +1,190 @@
+"""
+Opt-in Profiling für die Precision Engine.
+
+Zwei Modi, beide standardmäßig aus (ohne Konfiguration kein Overhead):
+
+1. Einzelrequest (deterministisch, cProfile): gesetztes ASTRO_PRECISION_PROFILE_TOKEN aktiviert
+   den Header `X-Astro-Profile: <token>` auf /compute (`?profile=1` ist optional und verlangt den
+   Header ebenfalls; der Token steht nie in der URL und damit nie im Access-Log). Der Request läuft
+   unter cProfile ohne Stage-Cache, die .prof-Datei landet in ASTRO_PRECISION_PROFILE_DIR (die
+   neuesten ASTRO_PRECISION_PROFILE_KEEP Dateien bleiben erhalten), eine Top-Liste in der Antwort.
+2. Kontinuierliches Sampling: ASTRO_PRECISION_SAMPLING_HZ > 0 startet einen Sampler-Thread, der
+   Stacks innerhalb von compute_horoscope / find_li_chun_utc / Crosschecks zählt und periodisch
+   als "folded stacks" (flamegraph.pl / speedscope) nach ASTRO_PRECISION_PROFILE_DIR schreibt.
+"""
+from __future__ import annotations
+
+import os
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple
+
+PROFILE_TOKEN_ENV = "ASTRO_PRECISION_PROFILE_TOKEN"
+PROFILE_DIR_ENV = "ASTRO_PRECISION_PROFILE_DIR"
+SAMPLING_HZ_ENV = "ASTRO_PRECISION_SAMPLING_HZ"
+PROFILE_KEEP_ENV = "ASTRO_PRECISION_PROFILE_KEEP"
+DEFAULT_PROFILE_DIR = "/tmp/astro-profiles"
+DEFAULT_PROFILE_KEEP = 50
+
+# Sampling: only stacks passing through one of these engine functions are recorded.
+SAMPLED_FUNCTIONS = frozenset({
+    "compute_horoscope",
+    "find_li_chun_utc",
+    "_crosscheck_sun_sign",
+    "_crosscheck_delta_t",
+    "_crosscheck_chinese_year",
+})
+
+def profile_dir() -> Path:
+    return Path(os.getenv(PROFILE_DIR_ENV, DEFAULT_PROFILE_DIR))
+
+def profile_keep() -> int:
+    return int(os.getenv(PROFILE_KEEP_ENV, str(DEFAULT_PROFILE_KEEP)))
+
+def profile_token() -> Optional[str]:
+    return os.getenv(PROFILE_TOKEN_ENV) or None
+
+def is_authorized(presented: Optional[str], token: Optional[str]) -> bool:
+    if not token or not presented:
+        return False
+    import hmac
+    return hmac.compare_digest(presented.encode("utf-8"), token.encode("utf-8"))
+
+# ----------------- Single request (cProfile)
+
+def profile_call(fn: Callable[..., Any], *args: Any, top: int = 30, **kwargs: Any) -> Tuple[Any, Dict[str, Any]]:
+    """
+    Run fn(*args, **kwargs) under cProfile. Returns (result, profile summary); the raw stats are
+    written to <profile_dir>/<profile_id> for snakeviz / pstats; only the newest profile_keep()
+    files are kept. The summary carries only the file name (profile_id), never the server path.
+    Exceptions from fn propagate unchanged; no profile is stored in that case.
+    """
+    # Imported here so that loading this module (main.py does at startup) stays cheap.
+    import cProfile
+    import io
+    import pstats
+
+    prof = cProfile.Profile()
+    t0 = time.perf_counter()
+    prof.enable()
+    try:
+        result = fn(*args, **kwargs)
+    finally:
+        prof.disable()
+    wall_s = time.perf_counter() - t0
+
+    out_dir = profile_dir()
+    out_dir.mkdir(parents=True, exist_ok=True)
+    path = out_dir / f"{getattr(fn, '__name__', 'call')}-{time.strftime('%Y%m%dT%H%M%S')}-{uuid.uuid4().hex[:12]}.prof"
+    prof.dump_stats(str(path))
+    _prune_profiles(out_dir, keep=profile_keep())
+
+    stats = pstats.Stats(prof, stream=io.StringIO())
+    rows = []
+    for (filename, lineno, func), (cc, nc, tt, ct, _callers) in stats.stats.items():
+        rows.append({
+            "function": f"{Path(filename).name}:{lineno}({func})",
+            "ncalls": nc,
+            "tottime_s": tt,
+            "cumtime_s": ct,
+        })
+    rows.sort(key=lambda r: r["cumtime_s"], reverse=True)
+    return result, {"wall_s": wall_s, "profile_id": path.name, "top": rows[:top]}
+
+def _prune_profiles(out_dir: Path, *, keep: int) -> None:
+    """Delete all but the newest `keep` .prof files (the VM disk is small)."""
+    files = []
+    for p in out_dir.glob("*.prof"):
+        try:
+            files.append((p.stat().st_mtime, p.name, p))
+        except FileNotFoundError:
+            continue
+    files.sort(reverse=True)
+    for _, _, p in files[max(keep, 1):]:
+        p.unlink(missing_ok=True)
+
+# ----------------- Continuous sampling
+
+def _frame_label(frame) -> str:
+    co = frame.f_code
+    return f"{Path(co.co_filename).name}:{co.co_name}"
+
+class StackSampler:
+    """
+    Low-rate wall-clock sampler over sys._current_frames(). Aggregates folded stacks in memory
+    and merges them into <out_dir>/engine.folded every flush_interval_s seconds.
+    """
+
+    def __init__(self, *, hz: float, out_dir: Path, flush_interval_s: float = 60.0):
+        if hz <= 0:
+            raise ValueError("hz must be positive")
+        self.interval_s = 1.0 / hz
+        self.out_path = out_dir / "engine.folded"
+        self.flush_interval_s = flush_interval_s
+        self._counts: Counter = Counter()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        self.out_path.parent.mkdir(parents=True, exist_ok=True)
+        self._thread = threading.Thread(target=self._run, name="astro-stack-sampler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        self.flush()
+
+    def sample_once(self) -> None:
+        own = threading.get_ident()
+        for thread_id, frame in sys._current_frames().items():
+            if thread_id == own:
+                continue
+            stack = []
+            while frame is not None:
+                stack.append(frame)
+                frame = frame.f_back
+            # Root the folded stack at the outermost engine entry point; ignore other threads.
+            for i in range(len(stack) - 1, -1, -1):
+                if stack[i].f_code.co_name in SAMPLED_FUNCTIONS:
+                    folded = ";".join(_frame_label(f) for f in reversed(stack[:i + 1]))
+                    with self._lock:
+                        self._counts[folded] += 1
+                    break
+
+    def flush(self) -> None:
+        with self._lock:
+            counts, self._counts = self._counts, Counter()
+        if not counts:
+            return
+        if self.out_path.exists():
+            for line in self.out_path.read_text(encoding="utf-8").splitlines():
+                stack, _, n = line.rpartition(" ")
+                if stack:
+                    counts[stack] += int(n)
+        tmp = self.out_path.with_suffix(".tmp")
+        tmp.write_text("".join(f"{s} {n}\n" for s, n in sorted(counts.items())), encoding="utf-8")
+        tmp.replace(self.out_path)
+
+    def _run(self) -> None:
+        next_flush = time.monotonic() + self.flush_interval_s
+        while not self._stop.wait(self.interval_s):
+            self.sample_once()
+            if time.monotonic() >= next_flush:
+                self.flush()
+                next_flush = time.monotonic() + self.flush_interval_s
+
+def start_sampler_from_env() -> Optional[StackSampler]:
+    """Start the continuous sampler if ASTRO_PRECISION_SAMPLING_HZ > 0; otherwise do nothing."""
+    hz = float(os.getenv(SAMPLING_HZ_ENV, "0") or 0)
+    if hz <= 0:
+        return None
+    sampler = StackSampler(hz=hz, out_dir=profile_dir())
+    sampler.start()
+    return sampler
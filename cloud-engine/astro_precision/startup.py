@@ -0,0 +1,171 @@
+"""
+Startup-Pfad der Cloud Engine: Warm-up, Import-Profiling und Startzeit-Benchmark.
+
+Fly startet Maschinen bei Bedarf (auto_start_machines), d.h. der Kaltstart landet direkt
+in der Latenz des ersten Users. `main.py` lädt deshalb swisseph/Engine erst verzögert und
+ruft `warm_up()` im Hintergrund auf; `/ready` meldet erst nach abgeschlossenem Warm-up 200.
+
+CLI (aus dem cloud-engine Verzeichnis):
+    python -m astro_precision.startup profile-imports [--top 25]
+    python -m astro_precision.startup bench [--runs 5] [--budget-ms 3000]
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+ENGINE_ROOT = Path(__file__).resolve().parents[1]
+
+# Regressions-Budget für `bench` (Median time-to-ready im frischen Prozess). Lokal ~0,8 s,
+# überwiegend FastAPI-Import; der Puffer fängt langsamere CI-Runner ab.
+DEFAULT_BUDGET_MS = 3000.0
+
+# Fester Referenz-Input: berührt alle Planeten, Häuser, Li-Chun-Scan, Crosschecks und tzdata.
+WARMUP_PAYLOAD: Dict[str, Any] = {
+    "birth_date": "2000-06-15",
+    "birth_time": "12:00:00",
+    "birth_location": {"lat": 52.52, "lon": 13.405},
+    "iana_time_zone": "Europe/Berlin",
+}
+
+def _ms(t0: float) -> float:
+    return round((time.perf_counter() - t0) * 1000.0, 3)
+
+def warm_up() -> Dict[str, Any]:
+    """
+    Explizite Warm-up-Phase: Engine importieren, Asset-Tabellen laden, Ephemeris-Probe
+    ausführen und einen Referenz-Horoskop rechnen (öffnet die Ephemeris-Dateien).
+
+    Der Referenz-Input läuft mit strict_mode=True (Default von /compute) und strict_mode=False,
+    damit beide Probe-Cache-Einträge und auch ohne SE_EPHE_PATH der tatsächlich genutzte
+    Rechenpfad (SWIEPH oder MOSEPH-Fallback) vorgewärmt sind.
+
+    "ready" basiert nur auf dem non-strict Lauf: ohne SE_EPHE_PATH (fly.toml) scheitert der
+    strict Lauf erwartungsgemäß vor jedem Ephemeris-Zugriff. Strict-Mode-Bereitschaft wird
+    also nicht geprüft, nur unter reference.strict berichtet.
+    """
+    timings: Dict[str, float] = {}
+    reference: Dict[str, Any] = {}
+
+    t0 = time.perf_counter()
+    from .core import engine
+    timings["import_engine_ms"] = _ms(t0)
+
+    t0 = time.perf_counter()
+    engine.prime_assets()
+    timings["assets_ms"] = _ms(t0)
+
+    for label, strict_mode in (("strict", True), ("non_strict", False)):
+        t0 = time.perf_counter()
+        result = engine.compute_horoscope(WARMUP_PAYLOAD, options=engine.ComputeOptions(strict_mode=strict_mode))
+        timings[f"reference_compute_{label}_ms"] = _ms(t0)
+        reference[label] = {
+            "status": result["validation"]["status"],
+            "engine_mode": result.get("audit", {}).get("engine_flags", {}).get("mode"),
+        }
+
+    return {
+        "ready": reference["non_strict"]["status"] != "error",
+        "timings_ms": timings,
+        "reference": reference,
+    }
+
+# ----------------- Profiling / Benchmark (CLI)
+
+def import_profile(statement: str = "import main", *, top: int = 25) -> List[Dict[str, Any]]:
+    """
+    Führt `statement` in einem frischen Interpreter mit `-X importtime` aus und liefert die
+    teuersten Module nach kumulativer Importzeit.
+    """
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        cwd=str(ENGINE_ROOT), capture_output=True, text=True, check=True,
+    )
+    rows: List[Dict[str, Any]] = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        rows.append({
+            "module": name.strip(),
+            "self_ms": int(self_us) / 1000.0,
+            "cumulative_ms": int(cumulative_us) / 1000.0,
+        })
+    rows.sort(key=lambda r: r["cumulative_ms"], reverse=True)
+    return rows[:top]
+
+_BENCH_SCRIPT = """
+import json, sys, time
+t0 = time.perf_counter()
+import main
+t_import = time.perf_counter()
+health_path_loaded_swisseph = "swisseph" in sys.modules
+from astro_precision.startup import warm_up
+report = warm_up()
+t_ready = time.perf_counter()
+print(json.dumps({
+    "import_main_ms": (t_import - t0) * 1000.0,
+    "ready_ms": (t_ready - t0) * 1000.0,
+    "health_path_loaded_swisseph": health_path_loaded_swisseph,
+    "warm_up": report,
+}))
+"""
+
+def bench_startup(*, runs: int = 5) -> Dict[str, Any]:
+    """Misst Kaltstart (Import von main.py bis Warm-up fertig) über `runs` frische Prozesse."""
+    samples: List[Dict[str, Any]] = []
+    for _ in range(runs):
+        t0 = time.perf_counter()
+        proc = subprocess.run(
+            [sys.executable, "-c", _BENCH_SCRIPT],
+            cwd=str(ENGINE_ROOT), capture_output=True, text=True, check=True,
+        )
+        sample = json.loads(proc.stdout.strip().splitlines()[-1])
+        sample["process_wall_ms"] = (time.perf_counter() - t0) * 1000.0
+        samples.append(sample)
+
+    return {
+        "runs": runs,
+        "median_import_main_ms": statistics.median(s["import_main_ms"] for s in samples),
+        "median_ready_ms": statistics.median(s["ready_ms"] for s in samples),
+        "median_process_wall_ms": statistics.median(s["process_wall_ms"] for s in samples),
+        "health_path_loaded_swisseph": any(s["health_path_loaded_swisseph"] for s in samples),
+        "samples": samples,
+    }
+
+def main(argv: Optional[List[str]] = None) -> int:
+    ap = argparse.ArgumentParser(prog="python -m astro_precision.startup")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+
+    p_imp = sub.add_parser("profile-imports", help="Import-time profile of main.py (python -X importtime)")
+    p_imp.add_argument("--statement", default="import main")
+    p_imp.add_argument("--top", type=int, default=25)
+
+    p_bench = sub.add_parser("bench", help="Startup-time benchmark with regression budget")
+    p_bench.add_argument("--runs", type=int, default=5)
+    p_bench.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS,
+                         help="Fail (exit 1) if the median time-to-ready exceeds this budget")
+    args = ap.parse_args(argv)
+
+    if args.cmd == "profile-imports":
+        print(json.dumps(import_profile(args.statement, top=args.top), indent=2))
+        return 0
+
+    out = bench_startup(runs=args.runs)
+    failures: List[str] = []
+    if out["health_path_loaded_swisseph"]:
+        failures.append("importing main.py loaded swisseph; the /health path must stay free of the engine")
+    if out["median_ready_ms"] > args.budget_ms:
+        failures.append(f"median time-to-ready {out['median_ready_ms']:.1f} ms exceeds budget {args.budget_ms:.1f} ms")
+    out["failures"] = failures
+    print(json.dumps(out, ensure_ascii=False, indent=2))
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,10 +1,87 @@
-from fastapi import FastAPI, HTTPException
+import time
+_PROCESS_T0 = time.perf_counter()
+
+import asyncio
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Header, HTTPException
+from fastapi.responses import JSONResponse
 from pydantic import BaseModel
+from starlette.concurrency import run_in_threadpool
 from typing import Optional, Dict, Any
-from astro_precision import compute_horoscope, ComputeOptions
 import os
+import threading
+
+from astro_precision.core.singleflight import AsyncSingleFlight
+from astro_precision.profiling import is_authorized, profile_token, start_sampler_from_env
+
+# astro_precision (and with it swisseph) is imported lazily: /health must answer without it.
+# The warm-up thread started in lifespan() imports and primes the engine and publishes it
+# via _engine; /compute waits for that instead of racing it on the import lock.
+# _startup is never mutated in place: /ready serializes it concurrently, so every update
+# publishes a new dict with a single assignment.
+_startup: Dict[str, Any] = {"ready": False}
+_engine = None
+_warm_up_started = False
+_warm_up_done = asyncio.Event()
+
+# Opt-in profiling (see astro_precision.profiling). Without a token /compute only checks for None.
+_PROFILE_TOKEN = profile_token()
+
+def _load_engine():
+    global _engine
+    if _engine is None:
+        from astro_precision.core import engine
+        _engine = engine
+    return _engine
+
+def _run_warm_up(loop: asyncio.AbstractEventLoop) -> None:
+    global _startup
+    report: Dict[str, Any] = dict(_startup)
+    t0 = time.perf_counter()
+    try:
+        _load_engine()
+        from astro_precision.startup import warm_up
+        report.update(warm_up())
+    except Exception as e:
+        # Fail closed: /ready stays 503, /compute falls back to importing the engine itself.
+        report["ready"] = False
+        report["warm_up_error"] = str(e)
+    report["warm_up_ms"] = round((time.perf_counter() - t0) * 1000.0, 3)
+    report["ready_after_ms"] = round((time.perf_counter() - _PROCESS_T0) * 1000.0, 3)
+    _startup = report
+    loop.call_soon_threadsafe(_warm_up_done.set)
 
-app = FastAPI(title="Cosmic Architecture Cloud Engine")
+async def _get_engine():
+    # Only wait if lifespan() actually started a warm-up; without lifespan (TestClient without
+    # `with`, --lifespan off, foreign ASGI host) the event would never be set.
+    if _warm_up_started:
+        await _warm_up_done.wait()
+    if _engine is None:
+        # Warm-up disabled, failed or never started: import off the event loop
+        await run_in_threadpool(_load_engine)
+    return _engine
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    global _startup, _warm_up_started
+    started_ms = round((time.perf_counter() - _PROCESS_T0) * 1000.0, 3)
+    if os.getenv("ASTRO_PRECISION_WARMUP", "1") == "0":
+        _startup = {**_startup, "app_started_after_ms": started_ms, "ready": True}
+    else:
+        _startup = {**_startup, "app_started_after_ms": started_ms}
+        _warm_up_started = True
+        loop = asyncio.get_running_loop()
+        threading.Thread(target=_run_warm_up, args=(loop,), name="astro-warm-up", daemon=True).start()
+    sampler = start_sampler_from_env()
+    yield
+    if sampler is not None:
+        sampler.stop()
+
+app = FastAPI(title="Cosmic Architecture Cloud Engine", lifespan=lifespan)
+
+# Identical concurrent /compute payloads (viral share links, frontend re-renders) wait on one
+# in-flight computation instead of each running their own.
+_compute_flights = AsyncSingleFlight()
 
 class BirthLocation(BaseModel):
     lat: float
@@ -22,20 +99,56 @@ class ComputeInput(BaseModel):
 def health_check():
     return {"status": "ok", "engine": "Cosmic v3.5"}
 
+@app.get("/ready")
+def readiness_check():
+    # Fly's http check targets this endpoint: 503 until the warm-up has touched the ephemeris.
+    startup = _startup
+    return JSONResponse(status_code=200 if startup["ready"] else 503, content=startup)
+
+@app.get("/metrics/coalescing")
+def coalescing_metrics():
+    # "http": /compute requests (coalesced on the event loop).
+    # "engine": synchronous in-process callers of compute_horoscope_coalesced (batch jobs, CLI);
+    # the HTTP path does not go through this layer.
+    from astro_precision import coalescing_stats
+    return {"http": _compute_flights.stats(), "engine": coalescing_stats()}
+
 @app.post("/compute")
-async def compute(input_data: ComputeInput):
+async def compute(
+    input_data: ComputeInput,
+    x_astro_profile: Optional[str] = Header(None),
+    profile: bool = False,
+):
+    # The token is only accepted as a header: query strings end up in the access log.
+    profile_requested = _PROFILE_TOKEN is not None and (x_astro_profile is not None or profile)
+    if profile_requested:
+        if not is_authorized(x_astro_profile, _PROFILE_TOKEN):
+            raise HTTPException(status_code=403, detail="profiling requires a valid X-Astro-Profile header")
+    engine = await _get_engine()
     try:
         # Map pydantic to dict for the engine
         data = input_data.dict()
         
         # Configure options
-        options = ComputeOptions(
+        options = engine.ComputeOptions(
             strict_mode=data.get("strict_mode", True),
             house_system=data.get("house_system", "P")
         )
         
-        # Run precision calculation
-        result = compute_horoscope(data, options=options)
+        if profile_requested:
+            # Profiled requests run on their own, never joining or leading a coalesced flight, and
+            # bypass the stage caches so the profile shows the real ephemeris/house/Li Chun work
+            from astro_precision.profiling import profile_call
+            result, profile_info = await run_in_threadpool(
+                profile_call, engine.compute_horoscope, data, options=options, stage_cache=False
+            )
+            return {**result, "profile": profile_info}
+
+        # Run precision calculation off the event loop; identical inputs share one run
+        key = engine.coalescing_key(data, options)
+        result, _ = await _compute_flights.do(
+            key, lambda: run_in_threadpool(engine.compute_horoscope, data, options=options)
+        )
         
         return result
     except Exception as e: